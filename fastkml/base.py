@@ -16,19 +16,61 @@
 
 """Abstract base classes"""
 
+from functools import lru_cache
+
 import fastkml.config as config
 from fastkml.config import etree
 
 
+@lru_cache(maxsize=None)
+def _tag(ns, name):
+    """Return the namespaced tag for ``name``, built once per namespace."""
+    return f"{ns}{name}"
+
+
+@lru_cache(maxsize=None)
+def _fields_by_tag(cls, ns):
+    """Return the _ALL_CHILDREN of ``cls`` keyed by the namespaced tag.
+
+    Matching the full tag avoids stripping the namespace of every child.
+    """
+    return {_tag(ns, name): field for name, field in cls._ALL_CHILDREN.items()}
+
+
+@lru_cache(maxsize=None)
+def _fields_to_tags(cls, ns):
+    """Return the _ALL_SIMPLE_FIELDS of ``cls`` as (attr, tag, to_text) tuples.
+
+    The tags are namespaced, so serializing does not build any tag strings.
+    """
+    return tuple(
+        (attr, _tag(ns, tag), to_text)
+        for attr, tag, _, to_text in cls._ALL_SIMPLE_FIELDS
+    )
+
+
 class _XMLObject:
     """XML Baseclass"""
 
     __name__ = None
-    ns = None
+    __slots__ = ("ns",)
 
     def __init__(self, ns=None):
         self.ns = config.KMLNS if ns is None else ns
 
+    def __getstate__(self):
+        # pickle protocols 0 and 1 need this for classes with __slots__
+        state = dict(getattr(self, "__dict__", {}))
+        for klass in type(self).__mro__:
+            for name in klass.__dict__.get("__slots__", ()):
+                if hasattr(self, name):
+                    state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
     def etree_element(self):
         if self.__name__:
             element = etree.Element(self.ns + self.__name__)
@@ -65,21 +107,77 @@ class _BaseObject(_XMLObject):
     Google Earth. The id attribute must be assigned if the <Update>
     mechanism is to be used."""
 
-    id = None
-    targetId = None
+    __slots__ = ("id", "targetId")
+    _SIMPLE_FIELDS = ()
+    # Simple child elements declared by this class, as
+    # (attribute, tag, from_text, to_text) tuples,
+    # e.g. ("width", "width", float, str).
+    # Fields that are None are not written, nor are those for which
+    # to_text returns None.
+    _ALL_SIMPLE_FIELDS = ()
+    # _SIMPLE_FIELDS of the class hierarchy, base classes first, filled in
+    # by __init_subclass__. This is also the order of serialization.
+    _ALL_CHILDREN = {}
+    # Maps the tag of each simple field to an (attribute, from_text) tuple
+    # for parsing.
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        fields = []
+        for klass in reversed(cls.__mro__):
+            fields.extend(klass.__dict__.get("_SIMPLE_FIELDS", ()))
+        cls._ALL_SIMPLE_FIELDS = tuple(fields)
+        cls._ALL_CHILDREN = {
+            tag: (attr, from_text) for attr, tag, from_text, _ in fields
+        }
 
     def __init__(self, ns=None, id=None):
         super().__init__(ns)
         self.id = id
+        self.targetId = None
         self.ns = config.KMLNS if ns is None else ns
 
     def etree_element(self):
         element = super().etree_element()
+        self.populate_element(element)
+        return element
+
+    def populate_element(self, element):
+        """Fill an already created element with the content of this object.
+
+        Use this together with ``etree.SubElement`` to build a child
+        directly inside its parent instead of appending a standalone element.
+        The simple fields of the class are added after the attributes.
+        """
         if self.id:
             element.set("id", self.id)
         if self.targetId:
             element.set("targetId", self.targetId)
-        return element
+        if self._ALL_SIMPLE_FIELDS:
+            # hot loop: look up the callables only once per element
+            sub_element = config._backend_for(element).SubElement
+            for attr, tag, to_text in _fields_to_tags(type(self), self.ns):
+                value = getattr(self, attr)
+                if value is not None:
+                    text = to_text(value)
+                    if text is not None:
+                        sub_element(element, tag).text = text
+
+    def _validate(self):
+        """Raise ValueError if this object cannot be serialized.
+
+        _sub_element calls this before the child is created, so a failure
+        leaves the parent unchanged.
+        """
+
+    def _sub_element(self, parent):
+        """Build this object as a new child of ``parent`` and return it."""
+        self._validate()
+        child = config._backend_for(parent).SubElement(
+            parent, _tag(self.ns, self.__name__)
+        )
+        self.populate_element(child)
+        return child
 
     def from_element(self, element):
         super().from_element(element)
@@ -87,3 +185,20 @@ class _BaseObject(_XMLObject):
             self.id = element.get("id")
         if element.get("targetId"):
             self.targetId = element.get("targetId")
+        if self._ALL_CHILDREN:
+            fields = _fields_by_tag(type(self), self.ns)
+            for child in element:
+                field = fields.get(child.tag)
+                if field is not None:
+                    attr, converter = field
+                    text = child.text
+                    setattr(self, attr, text if text is None else converter(text))
+                else:
+                    self._child_from_element(child)
+
+    def _child_from_element(self, child):
+        """Parse a child element that is not listed in _ALL_CHILDREN.
+
+        Subclasses override this for structured children, it is called
+        during the same pass over the children as the simple fields.
+        """
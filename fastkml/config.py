@@ -17,16 +17,23 @@
 """Frequently used constants and configuration options"""
 
 import logging
+import os
 import warnings
+import xml.etree.ElementTree as _std_etree
 
 try:
-    from lxml import etree
-
-    LXML = True
+    from lxml import etree as _lxml_etree
 except ImportError:
     warnings.warn("Package `lxml` missing. Pretty print will be disabled")
-    import xml.etree.ElementTree as etree
+    _lxml_etree = None
 
+# Set the environment variable FASTKML_ETREE=xml to use the standard library
+# ElementTree even when lxml is installed.
+if _lxml_etree is not None and os.environ.get("FASTKML_ETREE") != "xml":
+    etree = _lxml_etree
+    LXML = True
+else:
+    etree = _std_etree
     LXML = False
 
 logger = logging.getLogger(__name__)
@@ -36,10 +43,23 @@ KMLNS = "{http://www.opengis.net/kml/2.2}"  # noqa: FS003
 ATOMNS = "{http://www.w3.org/2005/Atom}"  # noqa: FS003
 GXNS = "{http://www.google.com/kml/ext/2.2}"  # noqa: FS003
 
-if hasattr(etree, "register_namespace"):
-    etree.register_namespace("kml", KMLNS[1:-1])
-    etree.register_namespace("atom", ATOMNS[1:-1])
-    etree.register_namespace("gx", GXNS[1:-1])
+for _etree in (_std_etree, _lxml_etree):
+    if hasattr(_etree, "register_namespace"):
+        _etree.register_namespace("kml", KMLNS[1:-1])
+        _etree.register_namespace("atom", ATOMNS[1:-1])
+        _etree.register_namespace("gx", GXNS[1:-1])
+
+
+def _backend_for(element):
+    """Return the etree module that created ``element``.
+
+    Sub elements must be created with the same library as their parent,
+    this allows filling elements that do not come from the configured etree.
+    """
+    if _lxml_etree is not None and isinstance(element, _lxml_etree._Element):
+        return _lxml_etree
+    return _std_etree
+
 
 FORCE3D = False
 
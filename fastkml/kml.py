@@ -376,11 +376,8 @@ class _Feature(_BaseObject):
 
     def styles(self):
         """iterate over the styles of this feature"""
-        for style in self._styles:
-            if isinstance(style, _StyleSelector):
-                yield style
-            else:
-                raise TypeError
+        # the styles were validated when they were appended
+        yield from self._styles
 
     @property
     def snippet(self):
@@ -464,9 +461,9 @@ class _Feature(_BaseObject):
             isopen = etree.SubElement(element, f"{self.ns}open")
             isopen.text = str(self.isopen)
         if self._styleUrl is not None:
-            element.append(self._styleUrl.etree_element())
+            self._styleUrl._sub_element(element)
         for style in self.styles():
-            element.append(style.etree_element())
+            style._sub_element(element)
         if self.snippet:
             snippet = etree.SubElement(element, f"{self.ns}Snippet")
             if isinstance(self.snippet, str):
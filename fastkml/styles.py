@@ -21,13 +21,58 @@ part of how your data is displayed.
 """
 
 import logging
+from functools import lru_cache
+from sys import intern
 
+import fastkml.config as config
 from fastkml.base import _BaseObject
+from fastkml.base import _tag
+from fastkml.config import _backend_for
 from fastkml.config import etree
 
 logger = logging.getLogger(__name__)
 
 
+def _float_int(text):
+    """Convert a numeric string like ``"1"`` or ``"0.0"`` to an int.
+
+    Most documents use plain integers, only fall back to float for others.
+    """
+    try:
+        return int(text)
+    except ValueError:
+        return int(float(text))
+
+
+def _str_if_set(value):
+    """Return the text of a field that is left out when it is empty."""
+    return str(value) if value else None
+
+
+def _to_xml(element):
+    """Serialize ``element`` without its tail."""
+    backend = _backend_for(element)
+    if backend is config._lxml_etree:
+        return backend.tostring(element, with_tail=False)
+    tail, element.tail = element.tail, None
+    try:
+        return backend.tostring(element)
+    finally:
+        element.tail = tail
+
+
+@lru_cache(maxsize=None)
+def _style_children(ns):
+    """Map the namespaced tags of the child styles of a Style to their class."""
+    return {_tag(ns, name): cls for name, cls in Style._CHILD_MAP.items()}
+
+
+@lru_cache(maxsize=None)
+def _pair_children(ns):
+    """Return the namespaced tags of the children of a StyleMap <Pair>."""
+    return _tag(ns, "key"), _tag(ns, "Style"), _tag(ns, "styleUrl")
+
+
 class StyleUrl(_BaseObject):
     """
     URL of a <Style> or <StyleMap> defined in a Document. If the style
@@ -36,23 +81,25 @@ class StyleUrl(_BaseObject):
     """
 
     __name__ = "styleUrl"
-    url = None
+    __slots__ = ("url",)
 
     def __init__(self, ns=None, id=None, url=None):
         super().__init__(ns, id)
         self.url = url
 
-    def etree_element(self):
-        if self.url:
-            element = super().etree_element()
-            element.text = self.url
-            return element
-        else:
+    def _validate(self):
+        if not self.url:
             raise ValueError("No url given for styleUrl")
 
+    def populate_element(self, element):
+        self._validate()
+        super().populate_element(element)
+        element.text = self.url
+
     def from_element(self, element):
         super().from_element(element)
-        self.url = element.text
+        url = element.text
+        self.url = url if url is None else intern(url)
 
 
 class _StyleSelector(_BaseObject):
@@ -64,6 +111,8 @@ class _StyleSelector(_BaseObject):
     by its id and its url.
     """
 
+    __slots__ = ()
+
 
 class Style(_StyleSelector):
     """
@@ -76,61 +125,46 @@ class Style(_StyleSelector):
     """
 
     __name__ = "Style"
-    _styles = None
+    __slots__ = ("_styles",)
+    _CHILD_MAP = {}
+    # Maps the tag of a child style to its class, in serialization order.
+    # Filled in once the style classes below are defined.
 
     def __init__(self, ns=None, id=None, styles=None):
         super().__init__(ns, id)
-        self._styles = []
-        if styles:
-            for style in styles:
-                self.append_style(style)
+        self._styles = list(styles) if styles else []
+        if not all(getattr(style, "_is_kml_style", False) for style in self._styles):
+            raise TypeError
 
     def append_style(self, style):
-        if isinstance(style, (_ColorStyle, BalloonStyle)):
+        if getattr(style, "_is_kml_style", False):
             self._styles.append(style)
         else:
             raise TypeError
 
     def styles(self):
-        for style in self._styles:
-            if isinstance(style, (_ColorStyle, BalloonStyle)):
-                yield style
-            else:
-                raise TypeError
+        # the styles were validated when they were appended
+        return iter(self._styles)
 
     def from_element(self, element):
         super().from_element(element)
-        style = element.find(f"{self.ns}IconStyle")
-        if style is not None:
-            thestyle = IconStyle(self.ns)
-            thestyle.from_element(style)
-            self.append_style(thestyle)
-        style = element.find(f"{self.ns}LineStyle")
-        if style is not None:
-            thestyle = LineStyle(self.ns)
-            thestyle.from_element(style)
-            self.append_style(thestyle)
-        style = element.find(f"{self.ns}PolyStyle")
-        if style is not None:
-            thestyle = PolyStyle(self.ns)
-            thestyle.from_element(style)
-            self.append_style(thestyle)
-        style = element.find(f"{self.ns}LabelStyle")
-        if style is not None:
-            thestyle = LabelStyle(self.ns)
-            thestyle.from_element(style)
-            self.append_style(thestyle)
-        style = element.find(f"{self.ns}BalloonStyle")
-        if style is not None:
-            thestyle = BalloonStyle(self.ns)
-            thestyle.from_element(style)
-            self.append_style(thestyle)
-
-    def etree_element(self):
-        element = super().etree_element()
-        for style in self.styles():
-            element.append(style.etree_element())
-        return element
+        style_classes = _style_children(self.ns)
+        found = {}
+        for child in element:
+            if child.tag in style_classes:
+                found.setdefault(child.tag, child)
+        for tag, style_class in style_classes.items():
+            style = found.get(tag)
+            if style is not None:
+                thestyle = style_class(self.ns)
+                thestyle.from_element(style)
+                self.append_style(thestyle)
+
+    def populate_element(self, element):
+        super().populate_element(element)
+        sub_element = _backend_for(element).SubElement
+        for style in self._styles:
+            style.populate_element(sub_element(element, _tag(style.ns, style.__name__)))
 
 
 class StyleMap(_StyleSelector):
@@ -142,57 +176,99 @@ class StyleMap(_StyleSelector):
     """
 
     __name__ = "StyleMap"
-    normal = None
-    highlight = None
+    __slots__ = ("_normal", "_highlight", "_normal_xml", "_highlight_xml")
+    _PAIR_DISPATCH = {"normal": "_normal_xml", "highlight": "_highlight_xml"}
+    # Maps the <key> of a <Pair> to the attribute that keeps its serialized
+    # element until the style is first accessed. Errors in the content of
+    # the style are raised on that access, not by from_element.
+    # The bytes are smaller than the parsed style and do not keep the
+    # source document alive.
 
     def __init__(self, ns=None, id=None, normal=None, highlight=None):
         super().__init__(ns, id)
         self.normal = normal
         self.highlight = highlight
 
+    @property
+    def normal(self):
+        if self._normal_xml is not None:
+            self._normal = self._style_from_xml(self._normal_xml)
+            self._normal_xml = None
+        return self._normal
+
+    @normal.setter
+    def normal(self, normal):
+        self._normal = normal
+        self._normal_xml = None
+
+    @property
+    def highlight(self):
+        if self._highlight_xml is not None:
+            self._highlight = self._style_from_xml(self._highlight_xml)
+            self._highlight_xml = None
+        return self._highlight
+
+    @highlight.setter
+    def highlight(self, highlight):
+        self._highlight = highlight
+        self._highlight_xml = None
+
     def from_element(self, element):
         super().from_element(element)
-        pairs = element.findall(f"{self.ns}Pair")
+        key_tag, style_tag, style_url_tag = _pair_children(self.ns)
+        pairs = element.findall(_tag(self.ns, "Pair"))
         for pair in pairs:
-            key = pair.find(f"{self.ns}key")
-            style = pair.find(f"{self.ns}Style")
-            style_url = pair.find(f"{self.ns}styleUrl")
-            if key.text == "highlight":
-                if style is not None:
-                    highlight = Style(self.ns)
-                    highlight.from_element(style)
-                elif style_url is not None:
-                    highlight = StyleUrl(self.ns)
-                    highlight.from_element(style_url)
-                else:
-                    raise ValueError
-                self.highlight = highlight
-            elif key.text == "normal":
-                if style is not None:
-                    normal = Style(self.ns)
-                    normal.from_element(style)
-                elif style_url is not None:
-                    normal = StyleUrl(self.ns)
-                    normal.from_element(style_url)
-                else:
-                    raise ValueError
-                self.normal = normal
-            else:
+            key = style = style_url = None
+            for child in pair:
+                if child.tag == key_tag:
+                    key = child
+                elif child.tag == style_tag:
+                    style = child
+                elif child.tag == style_url_tag:
+                    style_url = child
+            attr = self._PAIR_DISPATCH.get(key.text)
+            if attr is None:
                 raise ValueError
-
-    def etree_element(self):
-        element = super().etree_element()
-        if self.normal and isinstance(self.normal, (Style, StyleUrl)):
-            pair = etree.SubElement(element, f"{self.ns}Pair")
-            key = etree.SubElement(pair, f"{self.ns}key")
-            key.text = "normal"
-            pair.append(self.normal.etree_element())
-        if self.highlight and isinstance(self.highlight, (Style, StyleUrl)):
-            pair = etree.SubElement(element, f"{self.ns}Pair")
-            key = etree.SubElement(pair, f"{self.ns}key")
-            key.text = "highlight"
-            pair.append(self.highlight.etree_element())
-        return element
+            if style is None:
+                style = style_url
+            if style is None:
+                raise ValueError
+            # parsing is deferred until the style is accessed
+            setattr(self, attr, _to_xml(style))
+
+    def _style_from_xml(self, xml):
+        """Parse the serialized <Style> or <styleUrl> of a <Pair>."""
+        element = etree.XML(xml)
+        if element.tag == _tag(self.ns, "Style"):
+            selector = Style(self.ns)
+        else:
+            selector = StyleUrl(self.ns)
+        selector.from_element(element)
+        return selector
+
+    def _pairs(self):
+        """Return the (key, style) of each <Pair> to serialize."""
+        return [
+            (key, style)
+            for key, style in (("normal", self.normal), ("highlight", self.highlight))
+            if style and isinstance(style, (Style, StyleUrl))
+        ]
+
+    def _validate(self):
+        for _, style in self._pairs():
+            style._validate()
+
+    def populate_element(self, element):
+        # check both styles before the first <Pair> is added
+        self._validate()
+        super().populate_element(element)
+        sub_element = _backend_for(element).SubElement
+        pair_tag = _tag(self.ns, "Pair")
+        key_tag = _pair_children(self.ns)[0]
+        for key, style in self._pairs():
+            pair = sub_element(element, pair_tag)
+            sub_element(pair, key_tag).text = key
+            style._sub_element(pair)
 
 
 class _ColorStyle(_BaseObject):
@@ -204,56 +280,52 @@ class _ColorStyle(_BaseObject):
     subclasses are: IconStyle, LabelStyle, LineStyle, PolyStyle
     """
 
-    id = None
-    ns = None
-    color = None
-    # Color and opacity (alpha) values are expressed in hexadecimal notation.
-    # The range of values for any one color is 0 to 255 (00 to ff).
-    # For alpha, 00 is fully transparent and ff is fully opaque.
-    # The order of expression is aabbggrr, where aa=alpha (00 to ff);
-    # bb=blue (00 to ff); gg=green (00 to ff); rr=red (00 to ff).
-
-    colorMode = None
-    # Values for <colorMode> are normal (no effect) and random.
-    # A value of random applies a random linear scale to the base <color>
+    __slots__ = (
+        "color",
+        # Color and opacity (alpha) values are expressed in hexadecimal notation.
+        # The range of values for any one color is 0 to 255 (00 to ff).
+        # For alpha, 00 is fully transparent and ff is fully opaque.
+        # The order of expression is aabbggrr, where aa=alpha (00 to ff);
+        # bb=blue (00 to ff); gg=green (00 to ff); rr=red (00 to ff).
+        "colorMode",
+        # Values for <colorMode> are normal (no effect) and random.
+        # A value of random applies a random linear scale to the base <color>
+    )
+
+    _is_kml_style = True
+    # Marks the styles that can be appended to a Style.
+
+    _SIMPLE_FIELDS = (
+        # the same few colors and modes repeat throughout a document,
+        # interning them lets all styles share one string object
+        ("color", "color", intern, _str_if_set),
+        ("colorMode", "colorMode", intern, _str_if_set),
+    )
 
     def __init__(self, ns=None, id=None, color=None, colorMode=None):
         super().__init__(ns, id)
         self.color = color
         self.colorMode = colorMode
 
-    def etree_element(self):
-        element = super().etree_element()
-        if self.color:
-            color = etree.SubElement(element, f"{self.ns}color")
-            color.text = self.color
-        if self.colorMode:
-            colorMode = etree.SubElement(element, f"{self.ns}colorMode")
-            colorMode.text = self.colorMode
-        return element
-
-    def from_element(self, element):
-
-        super().from_element(element)
-        colorMode = element.find(f"{self.ns}colorMode")
-        if colorMode is not None:
-            self.colorMode = colorMode.text
-        color = element.find(f"{self.ns}color")
-        if color is not None:
-            self.color = color.text
-
 
 class IconStyle(_ColorStyle):
     """Specifies how icons for point Placemarks are drawn"""
 
     __name__ = "IconStyle"
-    scale = 1.0
-    # Resizes the icon. (float)
-    heading = None
-    # Direction (that is, North, South, East, West), in degrees.
-    # Default=0 (North).
-    icon_href = None
-    # An HTTP address or a local file specification used to load an icon.
+    __slots__ = (
+        "scale",
+        # Resizes the icon. (float)
+        "heading",
+        # Direction (that is, North, South, East, West), in degrees.
+        # Default=0 (North).
+        "icon_href",
+        # An HTTP address or a local file specification used to load an icon.
+    )
+
+    _SIMPLE_FIELDS = (
+        ("scale", "scale", float, str),
+        ("heading", "heading", float, str),
+    )
 
     def __init__(
         self,
@@ -270,31 +342,16 @@ class IconStyle(_ColorStyle):
         self.heading = heading
         self.icon_href = icon_href
 
-    def etree_element(self):
-        element = super().etree_element()
-        if self.scale is not None:
-            scale = etree.SubElement(element, f"{self.ns}scale")
-            scale.text = str(self.scale)
-        if self.heading:
-            heading = etree.SubElement(element, f"{self.ns}heading")
-            heading.text = str(self.heading)
+    def populate_element(self, element):
+        super().populate_element(element)
+        backend = _backend_for(element)
         if self.icon_href:
-            icon = etree.SubElement(element, f"{self.ns}Icon")
-            href = etree.SubElement(icon, f"{self.ns}href")
-            href.text = self.icon_href
-        return element
+            icon = backend.SubElement(element, _tag(self.ns, "Icon"))
+            backend.SubElement(icon, _tag(self.ns, "href")).text = self.icon_href
 
-    def from_element(self, element):
-        super().from_element(element)
-        scale = element.find(f"{self.ns}scale")
-        if scale is not None:
-            self.scale = float(scale.text)
-        heading = element.find(f"{self.ns}heading")
-        if heading is not None:
-            self.heading = float(heading.text)
-        icon = element.find(f"{self.ns}Icon")
-        if icon is not None:
-            href = icon.find(f"{self.ns}href")
+    def _child_from_element(self, child):
+        if child.tag == _tag(self.ns, "Icon"):
+            href = child.find(_tag(self.ns, "href"))
             if href is not None:
                 self.icon_href = href.text
 
@@ -308,26 +365,17 @@ class LineStyle(_ColorStyle):
     """
 
     __name__ = "LineStyle"
-    width = 1.0
-    # Width of the line, in pixels.
+    __slots__ = (
+        "width",
+        # Width of the line, in pixels.
+    )
+
+    _SIMPLE_FIELDS = (("width", "width", float, str),)
 
     def __init__(self, ns=None, id=None, color=None, colorMode=None, width=1):
         super().__init__(ns, id, color, colorMode)
         self.width = width
 
-    def etree_element(self):
-        element = super().etree_element()
-        if self.width is not None:
-            width = etree.SubElement(element, f"{self.ns}width")
-            width.text = str(self.width)
-        return element
-
-    def from_element(self, element):
-        super().from_element(element)
-        width = element.find(f"{self.ns}width")
-        if width is not None:
-            self.width = float(width.text)
-
 
 class PolyStyle(_ColorStyle):
     """
@@ -337,36 +385,24 @@ class PolyStyle(_ColorStyle):
     """
 
     __name__ = "PolyStyle"
-    fill = 1
-    # Boolean value. Specifies whether to fill the polygon.
-    outline = 1
-    # Boolean value. Specifies whether to outline the polygon.
-    # Polygon outlines use the current LineStyle.
+    __slots__ = (
+        "fill",
+        # Boolean value. Specifies whether to fill the polygon.
+        "outline",
+        # Boolean value. Specifies whether to outline the polygon.
+        # Polygon outlines use the current LineStyle.
+    )
+
+    _SIMPLE_FIELDS = (
+        ("fill", "fill", _float_int, str),
+        ("outline", "outline", _float_int, str),
+    )
 
     def __init__(self, ns=None, id=None, color=None, colorMode=None, fill=1, outline=1):
         super().__init__(ns, id, color, colorMode)
         self.fill = fill
         self.outline = outline
 
-    def etree_element(self):
-        element = super().etree_element()
-        if self.fill is not None:
-            fill = etree.SubElement(element, f"{self.ns}fill")
-            fill.text = str(self.fill)
-        if self.outline is not None:
-            outline = etree.SubElement(element, f"{self.ns}outline")
-            outline.text = str(self.outline)
-        return element
-
-    def from_element(self, element):
-        super().from_element(element)
-        fill = element.find(f"{self.ns}fill")
-        if fill is not None:
-            self.fill = int(float(fill.text))
-        outline = element.find(f"{self.ns}outline")
-        if outline is not None:
-            self.outline = int(float(outline.text))
-
 
 class LabelStyle(_ColorStyle):
     """
@@ -374,26 +410,17 @@ class LabelStyle(_ColorStyle):
     """
 
     __name__ = "LabelStyle"
-    scale = 1.0
-    # Resizes the label.
+    __slots__ = (
+        "scale",
+        # Resizes the label.
+    )
+
+    _SIMPLE_FIELDS = (("scale", "scale", float, str),)
 
     def __init__(self, ns=None, id=None, color=None, colorMode=None, scale=1.0):
         super().__init__(ns, id, color, colorMode)
         self.scale = scale
 
-    def etree_element(self):
-        element = super().etree_element()
-        if self.scale is not None:
-            scale = etree.SubElement(element, f"{self.ns}scale")
-            scale.text = str(self.scale)
-        return element
-
-    def from_element(self, element):
-        super().from_element(element)
-        scale = element.find(f"{self.ns}scale")
-        if scale is not None:
-            self.scale = float(scale.text)
-
 
 class BalloonStyle(_BaseObject):
     """Specifies how the description balloon for placemarks is drawn.
@@ -401,50 +428,57 @@ class BalloonStyle(_BaseObject):
     the balloon."""
 
     __name__ = "BalloonStyle"
-
-    bgColor = None
-    # Background color of the balloon (optional). Color and opacity (alpha)
-    # values are expressed in hexadecimal notation. The range of values for
-    # any one color is 0 to 255 (00 to ff). The order of expression is
-    # aabbggrr, where aa=alpha (00 to ff); bb=blue (00 to ff);
-    # gg=green (00 to ff); rr=red (00 to ff).
-    # For alpha, 00 is fully transparent and ff is fully opaque.
-    # For example, if you want to apply a blue color with 50 percent
-    # opacity to an overlay, you would specify the following:
-    # <bgColor>7fff0000</bgColor>, where alpha=0x7f, blue=0xff, green=0x00,
-    # and red=0x00. The default is opaque white (ffffffff).
-    # Note: The use of the <color> element within <BalloonStyle> has been
-    # deprecated. Use <bgColor> instead.
-
-    textColor = None
-    # Foreground color for text. The default is black (ff000000).
-
-    text = None
-    # Text displayed in the balloon. If no text is specified, Google Earth
-    # draws the default balloon (with the Feature <name> in boldface,
-    # the Feature <description>, links for driving directions, a white
-    # background, and a tail that is attached to the point coordinates of
-    # the Feature, if specified).
-    # You can add entities to the <text> tag using the following format to
-    # refer to a child element of Feature: $[name], $[description], $[address],
-    # $[id], $[Snippet]. Google Earth looks in the current Feature for the
-    # corresponding string entity and substitutes that information in the
-    # balloon.
-    # To include To here - From here driving directions in the balloon,
-    # use the $[geDirections] tag. To prevent the driving directions links
-    # from appearing in a balloon, include the <text> element with some content
-    # or with $[description] to substitute the basic Feature <description>.
-    # For example, in the following KML excerpt, $[name] and $[description]
-    # fields will be replaced by the <name> and <description> fields found
-    # in the Feature elements that use this BalloonStyle:
-    # <text>This is $[name], whose description is:<br/>$[description]</text>
-
-    displayMode = None
-    # If <displayMode> is default, Google Earth uses the information supplied
-    # in <text> to create a balloon . If <displayMode> is hide, Google Earth
-    # does not display the balloon. In Google Earth, clicking the List View
-    # icon for a Placemark whose balloon's <displayMode> is hide causes
-    # Google Earth to fly to the Placemark.
+    __slots__ = (
+        "bgColor",
+        # Background color of the balloon (optional). Color and opacity (alpha)
+        # values are expressed in hexadecimal notation. The range of values for
+        # any one color is 0 to 255 (00 to ff). The order of expression is
+        # aabbggrr, where aa=alpha (00 to ff); bb=blue (00 to ff);
+        # gg=green (00 to ff); rr=red (00 to ff).
+        # For alpha, 00 is fully transparent and ff is fully opaque.
+        # For example, if you want to apply a blue color with 50 percent
+        # opacity to an overlay, you would specify the following:
+        # <bgColor>7fff0000</bgColor>, where alpha=0x7f, blue=0xff, green=0x00,
+        # and red=0x00. The default is opaque white (ffffffff).
+        # Note: The use of the <color> element within <BalloonStyle> has been
+        # deprecated. Use <bgColor> instead.
+        "textColor",
+        # Foreground color for text. The default is black (ff000000).
+        "text",
+        # Text displayed in the balloon. If no text is specified, Google Earth
+        # draws the default balloon (with the Feature <name> in boldface,
+        # the Feature <description>, links for driving directions, a white
+        # background, and a tail that is attached to the point coordinates of
+        # the Feature, if specified).
+        # You can add entities to the <text> tag using the following format to
+        # refer to a child element of Feature: $[name], $[description], $[address],
+        # $[id], $[Snippet]. Google Earth looks in the current Feature for the
+        # corresponding string entity and substitutes that information in the
+        # balloon.
+        # To include To here - From here driving directions in the balloon,
+        # use the $[geDirections] tag. To prevent the driving directions links
+        # from appearing in a balloon, include the <text> element with some content
+        # or with $[description] to substitute the basic Feature <description>.
+        # For example, in the following KML excerpt, $[name] and $[description]
+        # fields will be replaced by the <name> and <description> fields found
+        # in the Feature elements that use this BalloonStyle:
+        # <text>This is $[name], whose description is:<br/>$[description]</text>
+        "displayMode",
+        # If <displayMode> is default, Google Earth uses the information supplied
+        # in <text> to create a balloon . If <displayMode> is hide, Google Earth
+        # does not display the balloon. In Google Earth, clicking the List View
+        # icon for a Placemark whose balloon's <displayMode> is hide causes
+        # Google Earth to fly to the Placemark.
+    )
+
+    _is_kml_style = True
+
+    _SIMPLE_FIELDS = (
+        ("bgColor", "bgColor", intern, str),
+        ("textColor", "textColor", intern, str),
+        ("text", "text", str, str),
+        ("displayMode", "displayMode", intern, str),
+    )
 
     def __init__(
         self,
@@ -461,40 +495,55 @@ class BalloonStyle(_BaseObject):
         self.text = text
         self.displayMode = displayMode
 
-    def from_element(self, element):
-        super().from_element(element)
-        bgColor = element.find(f"{self.ns}bgColor")
-        if bgColor is not None:
-            self.bgColor = bgColor.text
-        else:
-            bgColor = element.find(f"{self.ns}color")
-            if bgColor is not None:
-                self.bgColor = bgColor.text
-        textColor = element.find(f"{self.ns}textColor")
-        if textColor is not None:
-            self.textColor = textColor.text
-        text = element.find(f"{self.ns}text")
-        if text is not None:
-            self.text = text.text
-        displayMode = element.find(f"{self.ns}displayMode")
-        if displayMode is not None:
-            self.displayMode = displayMode.text
-
-    def etree_element(self):
-        element = super().etree_element()
-        if self.bgColor is not None:
-            elem = etree.SubElement(element, f"{self.ns}bgColor")
-            elem.text = self.bgColor
-        if self.textColor is not None:
-            elem = etree.SubElement(element, f"{self.ns}textColor")
-            elem.text = self.textColor
-        if self.text is not None:
-            elem = etree.SubElement(element, f"{self.ns}text")
-            elem.text = self.text
-        if self.displayMode is not None:
-            elem = etree.SubElement(element, f"{self.ns}displayMode")
-            elem.text = self.displayMode
-        return element
+    def _child_from_element(self, child):
+        # <color> is deprecated, it is only used when there is no <bgColor>
+        if (
+            child.tag == _tag(self.ns, "color")
+            and self.bgColor is None
+            and child.text is not None
+        ):
+            self.bgColor = intern(child.text)
+
+
+Style._CHILD_MAP = {
+    "IconStyle": IconStyle,
+    "LineStyle": LineStyle,
+    "PolyStyle": PolyStyle,
+    "LabelStyle": LabelStyle,
+    "BalloonStyle": BalloonStyle,
+}
+
+
+def iter_styles(source, ns=None):
+    """Iterate over the <Style> and <StyleMap> elements of a KML file.
+
+    This is meant for large KML files: the file is parsed incrementally and
+    every element is dropped from the tree once it has been processed, so
+    the whole document is never held in memory. Styles nested in a StyleMap
+    are part of that StyleMap and not returned on their own.
+    ``source`` is a filename or a file object.
+    """
+    ns = config.KMLNS if ns is None else ns
+    style_classes = {_tag(ns, "Style"): Style, _tag(ns, "StyleMap"): StyleMap}
+    parents = []
+    in_style = 0
+    for event, element in etree.iterparse(source, events=("start", "end")):
+        if event == "start":
+            if element.tag in style_classes:
+                in_style += 1
+            parents.append(element)
+            continue
+        parents.pop()
+        style_class = style_classes.get(element.tag)
+        if style_class is not None:
+            in_style -= 1
+            if not in_style:
+                style = style_class(ns)
+                style.from_element(element)
+                yield style
+        if not in_style and parents:
+            # the element is complete and processed, drop it from the tree
+            parents[-1].remove(element)
 
 
 __all__ = [
@@ -506,4 +555,5 @@ __all__ = [
     "Style",
     "StyleMap",
     "StyleUrl",
+    "iter_styles",
 ]
@@ -14,6 +14,9 @@
 # along with this library; if not, write to the Free Software Foundation, Inc.,
 # 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
 import datetime
+import decimal
+import pickle
+import tracemalloc
 import unittest
 
 from dateutil.tz import tzoffset
@@ -42,7 +45,11 @@ class BaseClassesTestCase(unittest.TestCase):
     and a TypeError on from_element"""
 
     def test_base_object(self):
-        bo = base._BaseObject(id="id0")
+        # _BaseObject uses __slots__, subclass it to set __name__ on instances
+        class BaseObject(base._BaseObject):
+            pass
+
+        bo = BaseObject(id="id0")
         self.assertEqual(bo.id, "id0")
         self.assertEqual(bo.ns, config.KMLNS)
         self.assertEqual(bo.targetId, None)
@@ -970,12 +977,188 @@ class StyleTestCase(unittest.TestCase):
         f2.from_string(f.to_string(prettyprint=True))
         self.assertEqual(f.to_string(), f2.to_string())
 
+    def test_style_populate_element(self):
+        style = styles.Style(
+            id="s1", styles=[styles.LineStyle(color="ff0000ff", width=2.0)]
+        )
+        parent = etree.Element(config.KMLNS + "Document")
+        child = etree.SubElement(parent, config.KMLNS + "Style")
+        style.populate_element(child)
+        self.assertEqual(child.get("id"), "s1")
+        line = child.find(config.KMLNS + "LineStyle")
+        self.assertEqual(line.find(config.KMLNS + "color").text, "ff0000ff")
+        self.assertEqual(line.find(config.KMLNS + "width").text, "2.0")
+        self.assertEqual(etree.tostring(child), etree.tostring(style.etree_element()))
+
+    def test_style_populate_stdlib_element(self):
+        import xml.etree.ElementTree as std_etree
+
+        style = styles.Style(styles=[styles.IconStyle(icon_href="icon.png")])
+        element = std_etree.Element(config.KMLNS + "Style")
+        self.assertIs(config._backend_for(element), std_etree)
+        style.populate_element(element)
+        icon_style = element.find(config.KMLNS + "IconStyle")
+        self.assertEqual(
+            icon_style.find(f"{config.KMLNS}Icon/{config.KMLNS}href").text,
+            "icon.png",
+        )
+
+    def test_style_populate_custom_lxml_element(self):
+        lxml_etree = config._lxml_etree
+        if lxml_etree is None:
+            self.skipTest("lxml is not installed")
+
+        class CustomElement(lxml_etree.ElementBase):
+            pass
+
+        parser = lxml_etree.XMLParser()
+        parser.set_element_class_lookup(
+            lxml_etree.ElementDefaultClassLookup(element=CustomElement)
+        )
+        element = lxml_etree.XML(f'<Style xmlns="{config.KMLNS[1:-1]}"/>', parser)
+        self.assertIsInstance(element, CustomElement)
+        self.assertIs(config._backend_for(element), lxml_etree)
+        styles.Style(styles=[styles.LineStyle(width=2)]).populate_element(element)
+        self.assertEqual(
+            element.find(f"{config.KMLNS}LineStyle/{config.KMLNS}width").text, "2"
+        )
+
+    def test_style_url_without_url(self):
+        d = kml.Document()
+        d._styleUrl = styles.StyleUrl()
+        element = etree.Element(config.KMLNS + "Placemark")
+        self.assertRaises(ValueError, d._styleUrl._sub_element, element)
+        self.assertEqual(len(element), 0)
+        self.assertRaises(ValueError, d.etree_element)
+        sm = styles.StyleMap(normal=styles.StyleUrl())
+        self.assertRaises(ValueError, sm.populate_element, element)
+        self.assertEqual(len(element), 0)
+        sm = styles.StyleMap(
+            normal=styles.Style(styles=[styles.LineStyle()]),
+            highlight=styles.StyleUrl(),
+        )
+        self.assertRaises(ValueError, sm.populate_element, element)
+        self.assertEqual(len(element), 0)
+        self.assertRaises(ValueError, sm._sub_element, element)
+        self.assertEqual(len(element), 0)
+        d = kml.Document(styles=[sm])
+        self.assertRaises(ValueError, d.etree_element)
+
+    def test_style_append_style(self):
+        style = styles.Style()
+        self.assertRaises(TypeError, style.append_style, styles.StyleUrl(url="#a"))
+        self.assertRaises(TypeError, style.append_style, styles.Style())
+        balloon_style = styles.BalloonStyle(text="hello")
+        style.append_style(balloon_style)
+        self.assertEqual(list(style.styles()), [balloon_style])
+        line_styles = [styles.LineStyle(width=1), styles.LineStyle(width=2)]
+        style = styles.Style(styles=iter(line_styles))
+        self.assertEqual(list(style.styles()), line_styles)
+        self.assertRaises(TypeError, styles.Style, styles=[styles.StyleUrl()])
+
+    def test_simple_fields_serialization_order(self):
+        icon_style = styles.IconStyle(color="ff00ff00", heading=0, icon_href="a.png")
+        element = icon_style.etree_element()
+        self.assertEqual(
+            [child.tag.replace(config.KMLNS, "") for child in element],
+            ["color", "scale", "heading", "Icon"],
+        )
+        self.assertEqual(element.find(config.KMLNS + "heading").text, "0")
+
+    def test_empty_color_not_serialized(self):
+        for style in (
+            styles.IconStyle(color="", colorMode=""),
+            styles.LineStyle(color="", colorMode=""),
+        ):
+            element = style.etree_element()
+            self.assertIsNone(element.find(config.KMLNS + "color"))
+            self.assertIsNone(element.find(config.KMLNS + "colorMode"))
+        balloon_style = styles.BalloonStyle(text="")
+        element = balloon_style.etree_element()
+        self.assertIsNotNone(element.find(config.KMLNS + "text"))
+
+    def test_parsed_colors_are_interned(self):
+        doc = """<Style xmlns="http://www.opengis.net/kml/2.2">
+          <LineStyle><color>ff0000ff</color><colorMode>random</colorMode></LineStyle>
+          <PolyStyle><color>ff0000ff</color><colorMode>random</colorMode></PolyStyle>
+        </Style>"""
+        style = styles.Style()
+        style.from_string(doc)
+        line_style, poly_style = style.styles()
+        self.assertIs(line_style.color, poly_style.color)
+        self.assertIs(line_style.colorMode, poly_style.colorMode)
+
+    def test_styles_use_slots(self):
+        for style in (
+            styles.StyleUrl(url="#a"),
+            styles.Style(),
+            styles.StyleMap(),
+            styles.IconStyle(),
+            styles.LineStyle(),
+            styles.PolyStyle(),
+            styles.LabelStyle(),
+            styles.BalloonStyle(),
+        ):
+            self.assertFalse(hasattr(style, "__dict__"))
+        self.assertEqual(styles.IconStyle().targetId, None)
+
+    def test_pickle_all_protocols(self):
+        style = styles.Style(
+            id="s1",
+            styles=[
+                styles.IconStyle(color="ff00ff00", icon_href="a.png"),
+                styles.LineStyle(width=2),
+            ],
+        )
+        style.targetId = "t1"
+        document = kml.Document(name="doc", styles=[style])
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            style2 = pickle.loads(pickle.dumps(style, protocol))
+            self.assertEqual(style2.id, "s1")
+            self.assertEqual(style2.targetId, "t1")
+            self.assertEqual(style2.to_string(), style.to_string())
+            document2 = pickle.loads(pickle.dumps(document, protocol))
+            self.assertEqual(document2.to_string(), document.to_string())
+
+    def test_number_formatting(self):
+        for width, text in (
+            (2, "2"),
+            (2.0, "2.0"),
+            (1.399999976158142, "1.399999976158142"),
+            (0.0, "0.0"),
+            (-0.0, "-0.0"),
+            (decimal.Decimal("1"), "1"),
+            (decimal.Decimal("1.00"), "1.00"),
+        ):
+            line_style = styles.LineStyle(width=width)
+            self.assertEqual(line_style.etree_element()[0].text, text)
+
+    def test_children_merged_along_hierarchy(self):
+        self.assertEqual(
+            set(styles.IconStyle._ALL_CHILDREN),
+            {"color", "colorMode", "scale", "heading"},
+        )
+        self.assertEqual(
+            set(styles.LineStyle._ALL_CHILDREN), {"color", "colorMode", "width"}
+        )
+        self.assertEqual(base._BaseObject._ALL_CHILDREN, {})
+
     def test_polystyle_fill(self):
         styles.PolyStyle()
 
     def test_polystyle_outline(self):
         styles.PolyStyle()
 
+    def test_polystyle_fill_outline_from_string(self):
+        ps = styles.PolyStyle()
+        ps.from_string(
+            '<PolyStyle xmlns="http://www.opengis.net/kml/2.2">'
+            "<fill>0</fill><outline>1.0</outline></PolyStyle>"
+        )
+        self.assertEqual(ps.fill, 0)
+        self.assertEqual(ps.outline, 1)
+        self.assertIsInstance(ps.outline, int)
+
 
 class StyleUsageTestCase(unittest.TestCase):
     def test_create_document_style(self):
@@ -1386,6 +1569,114 @@ class StyleFromStringTestCase(unittest.TestCase):
         k2.from_string(k.to_string())
         self.assertEqual(k.to_string(), k2.to_string())
 
+    def test_stylemap_invalid_pair(self):
+        doc = """<StyleMap xmlns="http://www.opengis.net/kml/2.2">
+            <Pair>
+              <key>%s</key>
+              %s
+            </Pair>
+          </StyleMap>"""
+        sm = styles.StyleMap()
+        self.assertRaises(
+            ValueError, sm.from_string, doc % ("other", "<styleUrl>#a</styleUrl>")
+        )
+        self.assertRaises(ValueError, sm.from_string, doc % ("normal", ""))
+        sm.from_string(doc % ("highlight", "<styleUrl>#a</styleUrl>"))
+        self.assertEqual(sm.highlight.url, "#a")
+        self.assertIsNone(sm.normal)
+
+    def test_stylemap_lazy_styles(self):
+        doc = """<StyleMap xmlns="http://www.opengis.net/kml/2.2">
+            <Pair>
+              <key>normal</key>
+              <Style><LineStyle><width>3</width></LineStyle></Style>
+            </Pair>
+            <Pair>
+              <key>highlight</key>
+              <styleUrl>#highlightState</styleUrl>
+            </Pair>
+          </StyleMap>"""
+        sm = styles.StyleMap()
+        sm.from_string(doc)
+        self.assertIsNone(sm._normal)
+        self.assertIsNone(sm._highlight)
+        self.assertEqual(list(sm.normal.styles())[0].width, 3)
+        self.assertIs(sm.normal, sm.normal)
+        self.assertIsNone(sm._highlight)
+        sm.highlight = None
+        self.assertIsNone(sm.highlight)
+        self.assertNotIn("highlight", sm.to_string())
+
+    def test_stylemap_releases_document(self):
+        doc = """<kml xmlns="http://www.opengis.net/kml/2.2"><Document>
+          <StyleMap><Pair>
+            <key>normal</key>
+            <Style><LineStyle><width>3</width></LineStyle></Style>
+          </Pair></StyleMap>
+          <Placemark><name>big</name></Placemark>
+        </Document></kml>"""
+        root = etree.XML(doc)
+        sm = styles.StyleMap()
+        sm.from_element(root.find(f"{config.KMLNS}Document/{config.KMLNS}StyleMap"))
+        self.assertIsInstance(sm._normal_xml, bytes)
+        self.assertNotIn(b"Placemark", sm._normal_xml)
+        self.assertEqual(list(sm.normal.styles())[0].width, 3)
+
+    def test_stylemap_unread_memory(self):
+        pair = """<Pair><key>%s</key><Style><IconStyle>
+            <color>ff00ff00</color><scale>1.1</scale>
+            <Icon><href>http://example.com/icon.png</href></Icon>
+          </IconStyle><LineStyle><color>ff0000ff</color><width>2</width>
+          </LineStyle><PolyStyle><fill>1</fill><outline>0</outline>
+          </PolyStyle></Style></Pair>"""
+        element = etree.XML(
+            '<StyleMap xmlns="http://www.opengis.net/kml/2.2">%s%s</StyleMap>'
+            % (pair % "normal", pair % "highlight")
+        )
+
+        def memory(read):
+            tracemalloc.start()
+            maps = []
+            for _ in range(100):
+                sm = styles.StyleMap()
+                sm.from_element(element)
+                if read:
+                    sm.normal, sm.highlight
+                maps.append(sm)
+            size = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            return size
+
+        memory(True)
+        # an unread StyleMap must not cost more than a parsed one
+        self.assertLessEqual(memory(False), memory(True))
+
+    def test_stylemap_pickle(self):
+        doc = """<StyleMap xmlns="http://www.opengis.net/kml/2.2" id="sm">
+            <Pair>
+              <key>normal</key>
+              <Style><LineStyle><width>3</width></LineStyle></Style>
+            </Pair>
+            <Pair>
+              <key>highlight</key>
+              <styleUrl>#highlightState</styleUrl>
+            </Pair>
+          </StyleMap>"""
+        sm = styles.StyleMap()
+        sm.from_string(doc)
+        sm.targetId = "target"
+        sm2 = pickle.loads(pickle.dumps(sm))
+        self.assertEqual(sm2.id, "sm")
+        self.assertEqual(sm2.targetId, "target")
+        self.assertEqual(list(sm2.normal.styles())[0].width, 3)
+        self.assertEqual(sm2.highlight.url, "#highlightState")
+        self.assertEqual(sm2.to_string(), sm.to_string())
+
+        sm.from_string(doc)
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            sm2 = pickle.loads(pickle.dumps(sm, protocol))
+            self.assertEqual(sm2.to_string(), sm.to_string())
+
     def test_get_style_by_url(self):
         doc = """<kml xmlns="http://www.opengis.net/kml/2.2">
         <Document>
@@ -1429,6 +1720,38 @@ class StyleFromStringTestCase(unittest.TestCase):
         self.assertIsInstance(style, styles.StyleMap)
 
 
+class IterStylesTestCase(unittest.TestCase):
+    def test_iter_styles(self):
+        import io
+
+        doc = b"""<kml xmlns="http://www.opengis.net/kml/2.2">
+        <Document>
+          <Style id="line"><LineStyle><width>4</width></LineStyle></Style>
+          <StyleMap id="map">
+            <Pair>
+              <key>normal</key>
+              <Style><LabelStyle><scale>2</scale></LabelStyle></Style>
+            </Pair>
+            <Pair>
+              <key>highlight</key>
+              <styleUrl>#line</styleUrl>
+            </Pair>
+          </StyleMap>
+          <Placemark>
+            <name>inline</name>
+            <Style id="poly"><PolyStyle><fill>0</fill></PolyStyle></Style>
+          </Placemark>
+        </Document>
+        </kml>"""
+
+        found = list(styles.iter_styles(io.BytesIO(doc)))
+        self.assertEqual([s.id for s in found], ["line", "map", "poly"])
+        self.assertEqual(list(found[0].styles())[0].width, 4)
+        self.assertEqual(list(found[1].normal.styles())[0].scale, 2)
+        self.assertEqual(found[1].highlight.url, "#line")
+        self.assertEqual(list(found[2].styles())[0].fill, 0)
+
+
 class DateTimeTestCase(unittest.TestCase):
     def test_timestamp(self):
         now = datetime.datetime.now()